@@ -6,465 +6,892 @@
 专注测试 AsyncExtractController 的所有功能
 """
 
-import requests
-import json
+import argparse
+import asyncio
+import aiohttp
+import contextlib
+import functools
+import logging
+import math
+import os
+import re
+import statistics
 import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import sys
 
+# orjson 序列化更快且直接产出bytes；未安装时回退到标准库json，输出格式保持一致
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+
+    def json_dumps_pretty(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+
+    def json_dumps(data):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    json_loads = json.loads
+
+    def json_dumps_pretty(data):
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+# 总结报告经由logging输出，EXTRACT_TEST_LOG=WARNING 时报告阶段不再构建任何输出
+logger = logging.getLogger('extract_test')
+_LOG_LEVEL = os.environ.get('EXTRACT_TEST_LOG', 'INFO').upper()
+# 无法识别的级别名回退到INFO，而不是在导入时抛出ValueError
+logger.setLevel(_LOG_LEVEL if isinstance(logging.getLevelName(_LOG_LEVEL), int) else logging.INFO)
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('%(message)s'))
+logger.addHandler(_log_handler)
+logger.propagate = False
+
 # 服务配置
 BASE_URL = "http://localhost:2701/api/v1/async"
 EXTRACT_URL = f"{BASE_URL}/extract"
 HEALTH_URL = f"{BASE_URL}/health"
 INFO_URL = f"{BASE_URL}/info"
 
+# 同时在途的最大请求数，避免并发请求压垮后端提取服务
+# 环境变量无法解析时回退到默认值，命令行入口会对原始值单独校验并报错
+_CONCURRENCY_ENV = os.environ.get("EXTRACT_TEST_CONCURRENCY", "16")
+try:
+    CONCURRENCY = int(_CONCURRENCY_ENV)
+except ValueError:
+    CONCURRENCY = 16
+# 是否默认打印完整响应JSON，命令行 --verbose 同样可以开启
+VERBOSE = os.environ.get("TEST_VERBOSE", "0") not in ("", "0")
+# 输出到终端时才逐条列出输入文本，重定向到日志时只保留数量信息
+_PRETTY = sys.stdout.isatty()
+
+# 错误响应最多读取的字节数，避免为诊断信息下载完整响应体
+ERROR_SNIPPET_BYTES = 256
+# 单个响应体的读取上限，服务异常返回超大响应时提前中止，避免耗尽内存
+MAX_RESPONSE_BYTES = 50 * 1024 * 1024
+# 连续失败达到该次数即判定服务不可用，后续用例直接跳过而不再等待超时（HTTP 4xx 不计入）
+MAX_FAIL_STREAK = 3
+
+# 输出分隔线
+_SEP = "=" * 60
+_DASH = "-" * 60
+_SEP_SHORT = "=" * 50
+_SEP_WIDE = "=" * 80
+
+# 单个提取测试的输出模板，每次测试只做%格式化
+_TEST_HEADER_TMPL = "\n🧪 %s\n" + _DASH
+_INPUT_INFO_TMPL = "📝 输入类型: %s | 大小: %d"
+_RESULT_OK_TMPL = "✅ 测试成功 | ⏱️ %.2f秒 | 🎯 成功: %s"
+_RESULT_MSG_TMPL = "💬 响应消息: %s"
+_RESULT_HTTP_FAIL_TMPL = "❌ 测试失败，HTTP状态码: %d"
+_RESULT_SNIPPET_TMPL = "📄 响应片段: %s"
+_RESULT_ERROR_TMPL = "❌ 测试异常: %s"
+_RESULT_SKIPPED_LINE = "⏭️  服务不可用，跳过该用例"
+
+# 失败原因分类: 一次正则扫描即可确定归类
+_ERROR_TYPE_RE = re.compile(r'(timeout|超时|connect|连接|unavailable|不可用|过大)', re.I)
+_ERROR_TYPE_MAP = {
+    'timeout': '请求超时', '超时': '请求超时',
+    'connect': '连接失败', '连接': '连接失败',
+    'unavailable': '服务不可用', '不可用': '服务不可用',
+    '过大': '响应过大',
+}
+
+# 请求超时配置（整个测试过程复用，避免每次请求重复构造）
+# 单次请求的timeout会整体替换会话默认值，因此每项都单独限定建连时间，
+# 服务不可达时几秒内即失败，而不是耗尽整个读取超时
+CONNECT_TIMEOUT = 3.05
+SESSION_TIMEOUT = aiohttp.ClientTimeout(total=45, connect=10, sock_connect=CONNECT_TIMEOUT)
+EXTRACT_TIMEOUT = aiohttp.ClientTimeout(total=30, sock_connect=CONNECT_TIMEOUT, sock_read=30)
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=10, sock_connect=CONNECT_TIMEOUT, sock_read=10)
+
+@dataclass(slots=True, frozen=True)
+class ExtractResult:
+    """提取接口响应，解析一次后以属性访问"""
+    success: Optional[bool]
+    message: str
+    http_status: int
+
+    @classmethod
+    def from_json(cls, data, http_status):
+        return cls(
+            success=data.get('success'),
+            message=data.get('message', ''),
+            http_status=http_status
+        )
+
+
+@dataclass(slots=True)
+class CaseResult:
+    """单个提取测试的结果记录"""
+    name: str
+    success: bool
+    input_type: str
+    elapsed_us: Optional[int] = None
+    async_success: Optional[bool] = None
+    message: str = ''
+    error: Optional[str] = None
+    http_status: Optional[int] = None
+
+
+# 请求体外层结构固定，只需序列化文本部分再拼接
+_BODY_PREFIX = b'{"textInput":'
+
+
+@functools.lru_cache(maxsize=None)
+def _body_suffix(extract_params):
+    """按extractParams预先序列化请求体结尾"""
+    # extractParams不传则使用默认值
+    if extract_params is None:
+        return b'}'
+    return b',"extractParams":' + json_dumps(extract_params) + b'}'
+
+
+@functools.lru_cache(maxsize=256)
+def _body(text_input, extract_params=None):
+    """序列化提取请求体，相同 (文本, 参数) 复用同一份bytes；数组输入以tuple传入"""
+    return _BODY_PREFIX + json_dumps(text_input) + _body_suffix(extract_params)
+
+
+def _encode_payload(text_input, extract_params=None):
+    """返回提取请求体的序列化bytes，列表输入转为tuple以便缓存"""
+    return _body(tuple(text_input) if type(text_input) is list else text_input, extract_params)
+
+
+# 测试用例: (测试名称, 文本输入, extractParams)
+STRING_TESTS = (
+    ("人员关系测试(字符串)", "刘德华是香港著名演员和歌手，出演过《无间道》等经典电影。", "triples"),
+    ("人员作品测试(字符串)", "周杰伦发行了专辑《叶惠美》，收录了经典歌曲《东风破》。", "entities"),
+    ("事件活动测试(字符串)", "2023年金马奖颁奖典礼在台北举行，刘德华获得最佳男主角奖。", "relations"),
+)
+
+ARRAY_TESTS = (
+    ("人员事件测试(数组)", [
+        "刘德华参加了2023年香港电影节。",
+        "周杰伦在演唱会上演唱了《青花瓷》。",
+        "张学友获得了金曲奖最佳男歌手。"
+    ], "triples"),
+    ("事件作品测试(数组)", [
+        "《流浪地球2》在春节档上映。",
+        "《满江红》票房突破40亿。",
+        "《深海》采用了全新的动画技术。"
+    ], "entities"),
+    ("综合全链路测试(数组)", [
+        "导演张艺谋执导了电影《满江红》。",
+        "易烊千玺在《满江红》中饰演主角。",
+        "《满江红》获得了春节档票房冠军。",
+        "影片讲述了南宋抗金的故事。"
+    ], "relations"),
+)
+
+# extractParams为None时不传，使用服务端默认值
+DEFAULT_PARAMS_TESTS = (
+    ("默认参数测试(字符串)", "成龙是功夫电影明星。", None),
+    ("默认参数测试(数组)", [
+        "李连杰主演了《黄飞鸿》。",
+        "甄子丹出演了《叶问》系列。",
+        "吴京导演了《战狼》。"
+    ], None),
+)
+
+# 基于成功的测试案例
+EVENT_WORK_TEST = ("事件作品关系测试(数组)", [
+    "金马奖颁奖典礼播放了《无间道》片段",
+    "柏林电影节展映《红高粱》",
+    "奥运会开幕式演唱《青花瓷》",
+    "音乐节演奏《东风破》"
+], "triples")
+
+SINGLE_EVENT_WORK_TESTS = (
+    ("电影节展映测试", "第95届奥斯卡颁奖典礼展映了《瞬息全宇宙》，该片获得最佳影片奖。", "triples"),
+    ("音乐会演奏测试", "维也纳新年音乐会演奏了《蓝色多瑙河》，现场观众热烈鼓掌。", "relations"),
+)
+
+# 错误场景: (描述, 预先序列化的请求体)
+ERROR_TESTS = tuple((desc, json_dumps(data)) for desc, data in (
+    ("空字符串", {"textInput": ""}),
+    ("空数组", {"textInput": []}),
+    ("缺少textInput", {}),
+    ("null文本", {"textInput": None}),
+))
+
+# 长文本处理测试文本，导入时构建一次
+SHORT_TEXT = "刘德华是香港著名演员，出演了《无间道》、《桃姐》等经典电影，同时也是优秀的歌手。"
+SHORT_TEXT_LEN = len(SHORT_TEXT)
+
+MEDIUM_TEXT = """
+周杰伦，华语流行音乐歌手、音乐人、演员、导演、编剧，1979年1月18日出生于台湾省新北市。
+2000年发行首张个人专辑《Jay》正式出道。2001年发行专辑《范特西》奠定其融合中西方音乐的风格。
+2002年举行"The One"世界巡回演唱会。2003年成为《时代》杂志封面人物。
+2004年获得世界音乐大奖中国区最畅销艺人奖。2005年凭借动作片《头文字D》获得台湾电影金马奖最佳新人奖。
+2007年自编自导的文艺片《不能说的秘密》获得台湾电影金马奖年度台湾杰出电影奖。
+""".strip()
+MEDIUM_TEXT_LEN = len(MEDIUM_TEXT)
+
+# 长文本测试用例
+LONG_TEXT = """
+张艺谋，中国电影导演，1950年4月2日出生于陕西省西安市。中国第五代导演代表人物之一。
+1978年进入北京电影学院摄影系学习。1982年毕业后分配到广西电影制片厂。
+1984年担任电影《一个和八个》的摄影师，该片获得中国电影金鸡奖最佳摄影奖。
+1987年执导处女作《红高粱》，该片获得第38届柏林国际电影节金熊奖，成为首部获得此殊荣的中国电影。
+1990年执导《菊豆》，该片获得第43届戛纳国际电影节路易斯·布努埃尔特别奖，并获得第63届奥斯卡金像奖最佳外语片提名。
+1991年执导《大红灯笼高高挂》，该片获得第48届威尼斯国际电影节银狮奖，并获得第64届奥斯卡金像奖最佳外语片提名。
+1992年执导《秋菊打官司》，该片获得第49届威尼斯国际电影节金狮奖。
+1994年执导《活着》，该片获得第47届戛纳国际电影节评审团大奖。
+1999年执导《我的父亲母亲》，该片获得第50届柏林国际电影节银熊奖。
+2002年执导《英雄》，该片以2.5亿元人民币成为中国电影票房冠军，并获得第75届奥斯卡金像奖最佳外语片提名。
+2004年执导《十面埋伏》，该片获得第61届威尼斯国际电影节未来数字电影奖。
+2006年执导《满城尽带黄金甲》，该片获得第79届奥斯卡金像奖最佳服装设计提名。
+2008年担任北京奥运会开幕式和闭幕式总导演。
+2011年执导《金陵十三钗》，该片获得第84届奥斯卡金像奖最佳外语片提名。
+2016年执导《长城》，这是他首部中美合拍的商业大片。
+2018年执导《影》，该片获得第55届台湾电影金马奖最佳导演奖。
+2021年执导《悬崖之上》，该片是他首部谍战题材电影。
+张艺谋的电影作品题材广泛，从农村题材到古装史诗，从现代都市到科幻奇幻，展现了深厚的艺术功底和多样化的创作能力。
+他善于运用色彩和视觉语言，形成了独特的"张艺谋式"电影美学。
+在国际电影界，张艺谋被誉为中国电影走向世界的重要推手，为中国电影在国际舞台上赢得了声誉。
+除了电影创作，张艺谋还涉足话剧、歌剧等艺术领域，展现了全方位的艺术才华。
+""".strip()
+LONG_TEXT_LEN = len(LONG_TEXT)
+
+# 知识图谱相关数据表，验证与清理SQL均由此生成
+MAIN_TABLES = ("celebrity", "work", "event")
+RELATION_TABLES = ("celebrity_celebrity", "celebrity_work", "celebrity_event", "event_work")
+ALL_TABLES = MAIN_TABLES + RELATION_TABLES
+
+_QUICK_VERIFY_SQL = (
+    "\n📋 快速验证SQL:\n```sql\n-- 检查所有表数据统计\n"
+    + "\nUNION ALL ".join(f"SELECT '{t}' AS table_name, COUNT(*) AS count FROM {t}" for t in ALL_TABLES)
+    + "\nORDER BY count DESC;\n```"
+)
+# MySQL 的 TRUNCATE 每次只能清空一张表，同时会重置 AUTO_INCREMENT
+_CLEANUP_SQL = (
+    "\n🗑️  清理测试数据:\n```sql\n-- 清理关系表\n"
+    + "\n".join(f"TRUNCATE TABLE {t};" for t in RELATION_TABLES)
+    + "\n-- 清理主表\n"
+    + "\n".join(f"TRUNCATE TABLE {t};" for t in MAIN_TABLES)
+    + "\n```"
+)
+
+# 功能特性总结
+_FEATURE_SUMMARY = """📋 异步接口:
+  ✅ POST /api/v1/async/extract - 异步文本提取
+  ✅ GET /api/v1/async/info - 服务信息
+  ✅ GET /api/v1/async/health - 健康检查
+
+🔧 技术特性:
+  • 立即响应: 所有请求立即返回成功状态
+  • 后台处理: 实际提取在后台异步执行
+  • 智能长度检测: ≤2000字符直接处理，>2000字符分批处理
+  • 格式支持: 支持字符串和JSON数组两种输入格式
+  • 参数灵活: extractParams支持triples/entities/relations，默认triples
+  • 高性能缓存: Caffeine缓存，提升处理效率
+  • 并行处理: 最多3个分片同时处理
+  • 数据库集成: 7张表完整存储知识图谱数据
+  • 完整关系支持: 人-人、人-作品、人-事件、事件-作品关系
+  • 完善的错误处理和日志记录"""
+
+# 导入时预先序列化所有固定用例的请求体，同时作为压测模式回放的请求集
+LOAD_CORPUS = tuple(
+    _encode_payload(_text, _params)
+    for _name, _text, _params in STRING_TESTS + ARRAY_TESTS + DEFAULT_PARAMS_TESTS
+    + (EVENT_WORK_TEST,) + SINGLE_EVENT_WORK_TESTS
+) + (
+    _encode_payload(SHORT_TEXT, "triples"),
+    _encode_payload(MEDIUM_TEXT, "entities"),
+    _encode_payload(LONG_TEXT, "relations"),
+)
+
 class AsyncExtractTester:
     """异步提取服务测试器"""
     
-    def __init__(self):
+    def __init__(self, verbose=VERBOSE, concurrency=CONCURRENCY):
         self.base_url = BASE_URL
-        self.session = requests.Session()
+        self.verbose = verbose
+        self.concurrency = concurrency
+        self.session = None
+        self._sem = asyncio.Semaphore(concurrency)
         self.test_results = []
-        self.test_start_time = datetime.now()
-        
-    def print_test_header(self, title):
-        """打印测试标题"""
-        print(f"\n{'='*60}")
-        print(f"  {title}")
-        print(f"{'='*60}")
+        # 汇总统计在记录结果时增量更新: 输入类型 -> [总数, 成功数]
+        self._successful = 0
+        self._total_elapsed_us = 0
+        self._min_elapsed_us, self._max_elapsed_us = math.inf, -math.inf
+        self._by_input_type = defaultdict(lambda: [0, 0])
+        self._error_types = Counter()
+        # gather捕获的未预期异常，同样计入总结报告
+        self.task_errors = []
+        self.error_scenarios_passed = True
+        self.test_start_ns = time.perf_counter_ns()
+        self.service_available = True
+        self._fail_streak = 0
+        # 服务响应确认之前提取请求逐个发出，成功后其余请求才并发派发，
+        # 连续失败达到上限则熔断，排队中的请求不再发出
+        self._service_confirmed = False
+        self._probe_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        """创建整个测试生命周期共享的持久连接池与HTTP会话"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=max(self.concurrency, 100),
+                # 单主机连接数不小于并发上限（至少20），连接池不会成为额外的瓶颈
+                limit_per_host=max(self.concurrency, 20),
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=SESSION_TIMEOUT,
+                headers={'Content-Type': 'application/json'}
+            )
+        return self
 
-    def print_response(self, response_data, title="响应"):
-        """格式化打印响应数据"""
-        print(f"\n{title}:")
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """关闭HTTP会话并释放连接池"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def test_header_lines(self, title):
+        """生成测试标题行，供并发测试组缓存后统一输出"""
+        return ["", _SEP, f"  {title}", _SEP]
+
+    def response_lines(self, response_data, title="响应"):
+        """生成响应数据的输出行，非verbose模式下只输出字段数量"""
+        if not self.verbose:
+            if isinstance(response_data, dict):
+                return [f"\n{title}: {len(response_data)} 个字段"]
+            return []
         if isinstance(response_data, dict):
-            print(json.dumps(response_data, ensure_ascii=False, indent=2))
-        else:
-            print(response_data)
+            return [f"\n{title}:", json_dumps_pretty(response_data).decode('utf-8')]
+        return [f"\n{title}:", str(response_data)]
+
+    def write_lines(self, lines):
+        """将一组测试收集的输出一次性写出"""
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+
+    def report_lines(self, lines):
+        """通过logging输出总结报告，格式化推迟到handler接受记录时"""
+        logger.info("%s", "\n".join(lines))
         
-    def check_service_health(self):
+    async def check_service_health(self):
         """检查异步服务健康状态"""
-        print("🏥 异步服务健康检查")
-        print("=" * 50)
+        lines = ["🏥 异步服务健康检查", _SEP_SHORT]
         
         try:
-            response = self.session.get(HEALTH_URL, timeout=10)
-            
-            if response.status_code == 200:
-                health_data = response.json()
-                print(f"✅ 服务状态: {health_data.get('status', 'unknown')}")
-                print(f"🔄 异步功能: {'已启用' if health_data.get('async_enabled') else '未启用'}")
-                return True
-            else:
-                print(f"⚠️  健康检查异常(HTTP {response.status_code})，但继续测试")
-                return True
+            async with self._sem, self.session.get(HEALTH_URL, timeout=PROBE_TIMEOUT) as response:
+                if response.status == 200:
+                    health_data = json_loads(await self.read_body(response))
+                    lines.append(f"✅ 服务状态: {health_data.get('status', 'unknown')}")
+                    lines.append(f"🔄 异步功能: {'已启用' if health_data.get('async_enabled') else '未启用'}")
+                    return True
+                else:
+                    lines.append(f"⚠️  健康检查异常(HTTP {response.status})，但继续测试")
+                    return True
                 
-        except requests.exceptions.ConnectionError:
-            print("❌ 异步服务连接失败 - 请确保服务已启动")
+        except aiohttp.ClientConnectionError:
+            lines.append("❌ 异步服务连接失败 - 请确保服务已启动")
             return False
         except Exception as e:
-            print(f"⚠️  健康检查异常: {e}，但尝试继续测试")
+            lines.append(f"⚠️  健康检查异常: {e}，但尝试继续测试")
             return True
+        finally:
+            self.write_lines(lines)
 
-    def test_async_extract(self, test_name, text_input, extract_params=None):
-        """异步提取接口测试方法"""
-        print(f"\n🧪 {test_name}")
-        print("-" * 60)
-        
-        # 构建请求数据
-        request_data = {"textInput": text_input}
+    def _record(self, r):
+        """保存单个测试结果并同步更新汇总统计"""
+        self.test_results.append(r)
+        counts = self._by_input_type[r.input_type]
+        counts[0] += 1
+        if r.success:
+            self._successful += 1
+            elapsed_us = r.elapsed_us or 0
+            self._total_elapsed_us += elapsed_us
+            if elapsed_us < self._min_elapsed_us:
+                self._min_elapsed_us = elapsed_us
+            if elapsed_us > self._max_elapsed_us:
+                self._max_elapsed_us = elapsed_us
+            counts[1] += 1
+        elif r.http_status and r.http_status != 200:
+            self._error_types[f"HTTP {r.http_status}"] += 1
+        else:
+            m = _ERROR_TYPE_RE.search(r.error or '')
+            self._error_types[_ERROR_TYPE_MAP[m.group(1).lower()] if m else "其他错误"] += 1
+
+    def all_passed(self):
+        """所有提取用例、错误场景均通过且没有未预期异常"""
+        return (self._successful == len(self.test_results)
+                and self.error_scenarios_passed
+                and not self.task_errors)
+
+    def task_error_lines(self, results, label):
+        """检查gather返回值，记录其中的异常并生成对应输出行"""
+        lines = []
+        for r in results:
+            if isinstance(r, Exception):
+                error = f"{label}: {type(r).__name__}: {r}"
+                self.task_errors.append(error)
+                lines.append(f"💥 执行异常 {error}")
+        return lines
+
+    def record_outcome(self, ok, http_status=None):
+        """记录请求结果，连续失败达到上限时熔断
+
+        HTTP 4xx 属于单个用例的问题，说明服务仍在正常响应，不计入连续失败次数
+        """
+        if ok:
+            self._fail_streak = 0
+            self._service_confirmed = True
+        elif http_status is not None and 400 <= http_status < 500:
+            self._service_confirmed = True
+        else:
+            self._fail_streak += 1
+            if self._fail_streak >= MAX_FAIL_STREAK:
+                self.service_available = False
+
+    @contextlib.asynccontextmanager
+    async def _probe_gate(self):
+        """服务可用性确认前串行放行提取请求，确认后直接并发"""
+        if not self._service_confirmed:
+            await self._probe_lock.acquire()
+            if not self._service_confirmed:
+                try:
+                    yield
+                finally:
+                    self._probe_lock.release()
+                return
+            self._probe_lock.release()
+        yield
+
+    async def read_body(self, response):
+        """读取响应体，超过MAX_RESPONSE_BYTES时中止读取"""
+        length = response.content_length
+        if length is not None:
+            if length > MAX_RESPONSE_BYTES:
+                raise ValueError(f"响应体过大: {length} 字节")
+            return await response.read()
+        
+        # 分块传输没有Content-Length，边读边检查累计大小
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(65536):
+            body += chunk
+            if len(body) > MAX_RESPONSE_BYTES:
+                raise ValueError(f"响应体过大: 超过 {MAX_RESPONSE_BYTES} 字节")
+        return bytes(body)
+
+    async def read_error_snippet(self, response):
+        """只读取错误响应体的前几百字节用于诊断"""
+        chunk = await response.content.read(ERROR_SNIPPET_BYTES)
+        return chunk.decode('utf-8', 'replace')
+
+    async def test_async_extract(self, test_name, text_input, extract_params=None, log=None):
+        """异步提取接口测试方法
+
+        传入log列表时输出追加到其中由调用方统一写出，否则完成后直接打印
+        """
+        # 并发执行时逐行打印会相互穿插，先收集输出，完成后一次性打印
+        lines = [_TEST_HEADER_TMPL % test_name]
         
-        # extractParams不传则使用默认值
-        if extract_params is not None:
-            request_data["extractParams"] = extract_params
+        # 构建请求数据，相同输入只序列化一次
+        payload = _encode_payload(text_input, extract_params)
         
         # 判断输入类型并显示
-        input_type = "数组" if isinstance(text_input, list) else "字符串"
-        input_size = len(text_input) if isinstance(text_input, list) else len(str(text_input))
-        print(f"📝 输入类型: {input_type} | 大小: {input_size}")
+        is_list = type(text_input) is list
+        input_type = "数组" if is_list else "字符串"
+        input_size = len(text_input)
+        lines.append(_INPUT_INFO_TMPL % (input_type, input_size))
         
         try:
-            start_time = time.time()
-            response = self.session.post(
-                EXTRACT_URL,
-                json=request_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
-            response_time = time.time() - start_time
-            
-            if response.status_code == 200:
-                result = response.json()
-                success = result.get('success', False)
-                message = result.get('message', '')
-                
-                print(f"✅ 测试成功 | ⏱️ {response_time:.2f}秒 | 🎯 成功: {success}")
-                print(f"💬 响应消息: {message}")
+            async with self._probe_gate(), self._sem:
+                # 排队等待期间可能已经熔断，拿到并发名额后再确认一次
+                if not self.service_available:
+                    lines.append(_RESULT_SKIPPED_LINE)
+                    self._record(CaseResult(
+                        name=test_name,
+                        success=False,
+                        input_type=input_type,
+                        error="服务不可用，已跳过"
+                    ))
+                    return False
                 
-                self.test_results.append({
-                    "name": test_name,
-                    "success": True,
-                    "response_time": response_time,
-                    "async_success": success,
-                    "input_type": input_type,
-                    "message": message
-                })
-                return True
-            else:
-                print(f"❌ 测试失败，HTTP状态码: {response.status_code}")
-                self.test_results.append({"name": test_name, "success": False, "input_type": input_type})
-                return False
+                t0 = time.perf_counter_ns()
+                async with self.session.post(
+                    EXTRACT_URL,
+                    data=payload,
+                    timeout=EXTRACT_TIMEOUT
+                ) as response:
+                    if response.status == 200:
+                        # 计时包含响应体下载，与压测模式的统计口径一致
+                        body = await self.read_body(response)
+                        elapsed_us = (time.perf_counter_ns() - t0) // 1000
+                        result = ExtractResult.from_json(json_loads(body), response.status)
+                        success = bool(result.success)
+                        
+                        lines.append(_RESULT_OK_TMPL % (elapsed_us / 1e6, success))
+                        lines.append(_RESULT_MSG_TMPL % result.message)
+                        
+                        self._record(CaseResult(
+                            name=test_name,
+                            success=True,
+                            input_type=input_type,
+                            elapsed_us=elapsed_us,
+                            async_success=success,
+                            message=result.message,
+                            http_status=response.status
+                        ))
+                        self.record_outcome(True)
+                        return True
+                    else:
+                        snippet = await self.read_error_snippet(response)
+                        lines.append(_RESULT_HTTP_FAIL_TMPL % response.status)
+                        lines.append(_RESULT_SNIPPET_TMPL % snippet)
+                        self._record(CaseResult(
+                            name=test_name,
+                            success=False,
+                            input_type=input_type,
+                            error=snippet,
+                            http_status=response.status
+                        ))
+                        self.record_outcome(False, response.status)
+                        return False
                 
         except Exception as e:
-            print(f"❌ 测试异常: {e}")
-            self.test_results.append({"name": test_name, "success": False, "input_type": input_type})
+            lines.append(_RESULT_ERROR_TMPL % e)
+            self._record(CaseResult(
+                name=test_name,
+                success=False,
+                input_type=input_type,
+                error=f"{type(e).__name__}: {e}"
+            ))
+            self.record_outcome(False)
             return False
+        finally:
+            if log is None:
+                self.write_lines(lines)
+            else:
+                log.extend(lines)
+
+    async def test_service_info(self, after=None):
+        """测试异步服务信息
 
-    def test_service_info(self):
-        """测试异步服务信息"""
-        self.print_test_header("异步服务信息测试")
+        after为与本请求并发进行的健康检查任务，等其输出完成后再打印，保持输出顺序
+        """
+        data = error = None
+        try:
+            async with self._sem, self.session.get(INFO_URL, timeout=PROBE_TIMEOUT) as response:
+                response.raise_for_status()
+                data = json_loads(await self.read_body(response))
+        except Exception as e:
+            error = e
+        
+        if after is not None:
+            await after
+        lines = self.test_header_lines("异步服务信息测试")
         
         try:
-            response = self.session.get(INFO_URL, timeout=10)
-            response.raise_for_status()
+            if error is not None:
+                lines.append(f"❌ 异步服务信息获取失败: {error}")
+                return False
             
-            data = response.json()
-            self.print_response(data, "异步服务信息")
-            print("✅ 异步服务信息获取成功")
+            lines.extend(self.response_lines(data, "异步服务信息"))
+            lines.append("✅ 异步服务信息获取成功")
             return True
-            
-        except Exception as e:
-            print(f"❌ 异步服务信息获取失败: {e}")
-            return False
+        finally:
+            self.write_lines(lines)
 
-    def test_error_scenarios(self):
-        """测试错误场景"""
-        self.print_test_header("错误场景测试")
-        
-        error_tests = [
-            {"data": {"textInput": ""}, "desc": "空字符串"},
-            {"data": {"textInput": []}, "desc": "空数组"},
-            {"data": {}, "desc": "缺少textInput"},
-            {"data": {"textInput": None}, "desc": "null文本"},
-        ]
-        
-        success_count = 0
-        
-        for test in error_tests:
-            try:
-                response = self.session.post(
-                    EXTRACT_URL,
-                    json=test["data"],
-                    headers={'Content-Type': 'application/json'},
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
+    async def _run_error_test(self, desc, payload, log):
+        """执行单个错误场景请求"""
+        try:
+            async with self._sem, self.session.post(
+                EXTRACT_URL,
+                data=payload,
+                timeout=PROBE_TIMEOUT
+            ) as response:
+                if response.status == 200:
+                    result = json_loads(await self.read_body(response))
                     if not result.get('success', True):  # 期望失败
-                        print(f"✅ {test['desc']}: 正确处理错误")
-                        success_count += 1
+                        log.append(f"✅ {desc}: 正确处理错误")
+                        return True
                     else:
-                        print(f"❌ {test['desc']}: 应该返回错误但成功了")
+                        log.append(f"❌ {desc}: 应该返回错误但成功了")
                 else:
-                    print(f"❌ {test['desc']}: HTTP错误 {response.status_code}")
+                    log.append(f"❌ {desc}: HTTP错误 {response.status} | {await self.read_error_snippet(response)}")
                     
-            except Exception as e:
-                print(f"❌ {test['desc']}: 异常 {e}")
-        
-        print(f"📊 错误场景测试成功率: {success_count/len(error_tests)*100:.1f}%")
-        return success_count == len(error_tests)
+        except Exception as e:
+            log.append(f"❌ {desc}: 异常 {e}")
+        return False
 
-    def run_string_format_tests(self):
+    async def test_error_scenarios(self):
+        """测试错误场景，返回该组的输出行"""
+        lines = self.test_header_lines("错误场景测试")
+        
+        logs = [[] for _ in ERROR_TESTS]
+        results = await asyncio.gather(
+            *(self._run_error_test(desc, payload, log) for (desc, payload), log in zip(ERROR_TESTS, logs)),
+            return_exceptions=True
+        )
+        success_count = sum(1 for r in results if r is True)
+        
+        lines.extend(line for log in logs for line in log)
+        lines.extend(self.task_error_lines(results, "错误场景测试"))
+        lines.append(f"📊 错误场景测试成功率: {success_count/len(ERROR_TESTS)*100:.1f}%")
+        self.error_scenarios_passed = success_count == len(ERROR_TESTS)
+        return lines
+
+    async def run_test_group(self, title, label, cases):
+        """一次性并发派发整组用例 (测试名称, 文本输入, extractParams)，返回按提交顺序排列的输出行"""
+        logs = [[f"\n[{label} {i}/{len(cases)}]"] for i in range(1, len(cases) + 1)]
+        results = await asyncio.gather(
+            *(self.test_async_extract(name, text_input, params, log)
+              for (name, text_input, params), log in zip(cases, logs)),
+            return_exceptions=True
+        )
+        lines = self.test_header_lines(title)
+        lines.extend(line for log in logs for line in log)
+        lines.extend(self.task_error_lines(results, title))
+        return lines
+
+    async def run_string_format_tests(self):
         """运行字符串格式测试"""
-        self.print_test_header("字符串格式异步提取测试")
-        
-        string_tests = [
-            {
-                "name": "人员关系测试(字符串)",
-                "text": "刘德华是香港著名演员和歌手，出演过《无间道》等经典电影。",
-                "params": "triples"
-            },
-            {
-                "name": "人员作品测试(字符串)", 
-                "text": "周杰伦发行了专辑《叶惠美》，收录了经典歌曲《东风破》。",
-                "params": "entities"
-            },
-            {
-                "name": "事件活动测试(字符串)",
-                "text": "2023年金马奖颁奖典礼在台北举行，刘德华获得最佳男主角奖。",
-                "params": "relations"
-            }
-        ]
-        
-        for i, test in enumerate(string_tests, 1):
-            print(f"\n[字符串测试 {i}/{len(string_tests)}]")
-            self.test_async_extract(test["name"], test["text"], test["params"])
-
-    def run_array_format_tests(self):
+        return await self.run_test_group("字符串格式异步提取测试", "字符串测试", STRING_TESTS)
+
+    async def run_array_format_tests(self):
         """运行JSON数组格式测试"""
-        self.print_test_header("JSON数组格式异步提取测试")
-        
-        array_tests = [
-            {
-                "name": "人员事件测试(数组)",
-                "texts": [
-                    "刘德华参加了2023年香港电影节。",
-                    "周杰伦在演唱会上演唱了《青花瓷》。",
-                    "张学友获得了金曲奖最佳男歌手。"
-                ],
-                "params": "triples"
-            },
-            {
-                "name": "事件作品测试(数组)",
-                "texts": [
-                    "《流浪地球2》在春节档上映。",
-                    "《满江红》票房突破40亿。",
-                    "《深海》采用了全新的动画技术。"
-                ],
-                "params": "entities"
-            },
-            {
-                "name": "综合全链路测试(数组)",
-                "texts": [
-                    "导演张艺谋执导了电影《满江红》。",
-                    "易烊千玺在《满江红》中饰演主角。",
-                    "《满江红》获得了春节档票房冠军。",
-                    "影片讲述了南宋抗金的故事。"
-                ],
-                "params": "relations"
-            }
-        ]
-        
-        for i, test in enumerate(array_tests, 1):
-            print(f"\n[数组测试 {i}/{len(array_tests)}]")
-            self.test_async_extract(test["name"], test["texts"], test["params"])
-
-    def run_default_params_tests(self):
+        return await self.run_test_group("JSON数组格式异步提取测试", "数组测试", ARRAY_TESTS)
+
+    async def run_default_params_tests(self):
         """测试默认参数"""
-        self.print_test_header("默认参数测试")
-        
-        default_tests = [
-            {
-                "name": "默认参数测试(字符串)",
-                "text": "成龙是功夫电影明星。"
-            },
-            {
-                "name": "默认参数测试(数组)", 
-                "texts": [
-                    "李连杰主演了《黄飞鸿》。",
-                    "甄子丹出演了《叶问》系列。",
-                    "吴京导演了《战狼》。"
-                ]
-            }
-        ]
-        
-        for i, test in enumerate(default_tests, 1):
-            print(f"\n[默认参数测试 {i}/{len(default_tests)}]")
-            text_input = test.get("text") or test.get("texts")
-            self.test_async_extract(test["name"], text_input)
-
-    def run_event_work_tests(self):
+        return await self.run_test_group("默认参数测试", "默认参数测试", DEFAULT_PARAMS_TESTS)
+
+    async def run_event_work_tests(self):
         """运行事件-作品关系测试"""
-        self.print_test_header("事件-作品关系测试")
-        
-        # 基于您成功的测试案例
-        event_work_test = {
-            "name": "事件作品关系测试(数组)",
-            "texts": [
-                "金马奖颁奖典礼播放了《无间道》片段",
-                "柏林电影节展映《红高粱》",
-                "奥运会开幕式演唱《青花瓷》",
-                "音乐节演奏《东风破》"
-            ],
-            "params": "triples"
-        }
-        
-        print(f"\n🧪 {event_work_test['name']}")
-        print(f"📝 输入类型: 数组 | 大小: {len(event_work_test['texts'])}")
-        print("💡 专门测试事件与作品之间的关系提取")
-        print("🎯 预期生成: event_work 表数据")
-        
-        for i, text in enumerate(event_work_test['texts'], 1):
-            print(f"  {i}. {text}")
-        
-        self.test_async_extract(event_work_test['name'], event_work_test['texts'], event_work_test['params'])
-        
-        # 追加单个事件-作品关系测试
-        single_event_work_tests = [
-            {
-                "name": "电影节展映测试",
-                "text": "第95届奥斯卡颁奖典礼展映了《瞬息全宇宙》，该片获得最佳影片奖。",
-                "params": "triples"
-            },
-            {
-                "name": "音乐会演奏测试", 
-                "text": "维也纳新年音乐会演奏了《蓝色多瑙河》，现场观众热烈鼓掌。",
-                "params": "relations"
-            }
-        ]
-        
-        for i, test in enumerate(single_event_work_tests, 1):
-            print(f"\n[事件作品测试 {i}/{len(single_event_work_tests)}]")
-            self.test_async_extract(test['name'], test['text'], test['params'])
-
-    def run_long_text_tests(self):
+        lines = self.test_header_lines("事件-作品关系测试")
+        
+        name, texts, params = EVENT_WORK_TEST
+        lines.append(f"\n🧪 {name}")
+        lines.append(f"📝 输入类型: 数组 | 大小: {len(texts)}")
+        lines.append("💡 专门测试事件与作品之间的关系提取")
+        lines.append("🎯 预期生成: event_work 表数据")
+        
+        if _PRETTY:
+            lines.extend(f"  {i}. {text}" for i, text in enumerate(texts, 1))
+        
+        # 数组测试与单个事件-作品关系测试相互独立，并发派发后按顺序输出
+        logs = [[f"\n[事件作品测试 {i}/{len(SINGLE_EVENT_WORK_TESTS)}]"]
+                for i in range(1, len(SINGLE_EVENT_WORK_TESTS) + 1)]
+        results = await asyncio.gather(
+            self.test_async_extract(name, texts, params, lines),
+            *(self.test_async_extract(single_name, text, single_params, log)
+              for (single_name, text, single_params), log in zip(SINGLE_EVENT_WORK_TESTS, logs)),
+            return_exceptions=True
+        )
+        
+        lines.extend(line for log in logs for line in log)
+        lines.extend(self.task_error_lines(results, "事件-作品关系测试"))
+        return lines
+
+    async def run_long_text_tests(self):
         """运行长文本处理测试"""
-        self.print_test_header("长文本处理测试")
+        lines = self.test_header_lines("长文本处理测试")
         
         # 短文本测试
-        short_text = "刘德华是香港著名演员，出演了《无间道》、《桃姐》等经典电影，同时也是优秀的歌手。"
-        print(f"\n🧪 短文本处理测试")
-        print(f"📝 文本长度: {len(short_text)} 字符")
-        self.test_async_extract("短文本异步处理", short_text, "triples")
+        short_log = ["\n🧪 短文本处理测试", f"📝 文本长度: {SHORT_TEXT_LEN} 字符"]
         
         # 中等文本测试
-        medium_text = """
-        周杰伦，华语流行音乐歌手、音乐人、演员、导演、编剧，1979年1月18日出生于台湾省新北市。
-        2000年发行首张个人专辑《Jay》正式出道。2001年发行专辑《范特西》奠定其融合中西方音乐的风格。
-        2002年举行"The One"世界巡回演唱会。2003年成为《时代》杂志封面人物。
-        2004年获得世界音乐大奖中国区最畅销艺人奖。2005年凭借动作片《头文字D》获得台湾电影金马奖最佳新人奖。
-        2007年自编自导的文艺片《不能说的秘密》获得台湾电影金马奖年度台湾杰出电影奖。
-        """.strip()
-        print(f"\n🧪 中等文本处理测试")
-        print(f"📝 文本长度: {len(medium_text)} 字符")
-        self.test_async_extract("中等文本异步处理", medium_text, "entities")
+        medium_log = ["\n🧪 中等文本处理测试", f"📝 文本长度: {MEDIUM_TEXT_LEN} 字符"]
         
         # 长文本测试（超过2000字符）
-        long_text = """
-        张艺谋，中国电影导演，1950年4月2日出生于陕西省西安市。中国第五代导演代表人物之一。
-        1978年进入北京电影学院摄影系学习。1982年毕业后分配到广西电影制片厂。
-        1984年担任电影《一个和八个》的摄影师，该片获得中国电影金鸡奖最佳摄影奖。
-        1987年执导处女作《红高粱》，该片获得第38届柏林国际电影节金熊奖，成为首部获得此殊荣的中国电影。
-        1990年执导《菊豆》，该片获得第43届戛纳国际电影节路易斯·布努埃尔特别奖，并获得第63届奥斯卡金像奖最佳外语片提名。
-        1991年执导《大红灯笼高高挂》，该片获得第48届威尼斯国际电影节银狮奖，并获得第64届奥斯卡金像奖最佳外语片提名。
-        1992年执导《秋菊打官司》，该片获得第49届威尼斯国际电影节金狮奖。
-        1994年执导《活着》，该片获得第47届戛纳国际电影节评审团大奖。
-        1999年执导《我的父亲母亲》，该片获得第50届柏林国际电影节银熊奖。
-        2002年执导《英雄》，该片以2.5亿元人民币成为中国电影票房冠军，并获得第75届奥斯卡金像奖最佳外语片提名。
-        2004年执导《十面埋伏》，该片获得第61届威尼斯国际电影节未来数字电影奖。
-        2006年执导《满城尽带黄金甲》，该片获得第79届奥斯卡金像奖最佳服装设计提名。
-        2008年担任北京奥运会开幕式和闭幕式总导演。
-        2011年执导《金陵十三钗》，该片获得第84届奥斯卡金像奖最佳外语片提名。
-        2016年执导《长城》，这是他首部中美合拍的商业大片。
-        2018年执导《影》，该片获得第55届台湾电影金马奖最佳导演奖。
-        2021年执导《悬崖之上》，该片是他首部谍战题材电影。
-        张艺谋的电影作品题材广泛，从农村题材到古装史诗，从现代都市到科幻奇幻，展现了深厚的艺术功底和多样化的创作能力。
-        他善于运用色彩和视觉语言，形成了独特的"张艺谋式"电影美学。
-        在国际电影界，张艺谋被誉为中国电影走向世界的重要推手，为中国电影在国际舞台上赢得了声誉。
-        除了电影创作，张艺谋还涉足话剧、歌剧等艺术领域，展现了全方位的艺术才华。
-        """.strip()
-        print(f"\n🧪 长文本处理测试")
-        print(f"📝 文本长度: {len(long_text)} 字符 (预期触发分批处理)")
-        self.test_async_extract("长文本异步处理", long_text, "relations")
+        long_log = ["\n🧪 长文本处理测试", f"📝 文本长度: {LONG_TEXT_LEN} 字符 (预期触发分批处理)"]
+        
+        # 三种长度的文本并发提交，整体耗时取决于最慢的一个
+        results = await asyncio.gather(
+            self.test_async_extract("短文本异步处理", SHORT_TEXT, "triples", short_log),
+            self.test_async_extract("中等文本异步处理", MEDIUM_TEXT, "entities", medium_log),
+            self.test_async_extract("长文本异步处理", LONG_TEXT, "relations", long_log),
+            return_exceptions=True
+        )
+        
+        lines.extend(short_log + medium_log + long_log)
+        lines.extend(self.task_error_lines(results, "长文本处理测试"))
+        return lines
+
+    async def run_all(self):
+        """并发执行所有相互独立的测试组，并发上限由连接信号量控制
+
+        各组只返回输出行，全部完成后按声明顺序写出，输出顺序不受完成先后影响
+        """
+        groups = (
+            ("错误场景测试", self.test_error_scenarios),
+            ("字符串格式测试", self.run_string_format_tests),
+            ("数组格式测试", self.run_array_format_tests),
+            ("默认参数测试", self.run_default_params_tests),
+            ("事件-作品关系测试", self.run_event_work_tests),
+            ("长文本处理测试", self.run_long_text_tests),
+        )
+        results = await asyncio.gather(*(run() for _, run in groups), return_exceptions=True)
+        
+        # 单个测试组内部出错时不影响其它组，但异常必须在输出与总结中体现
+        for (label, _), result in zip(groups, results):
+            if isinstance(result, Exception):
+                self.write_lines(self.task_error_lines([result], label))
+            else:
+                self.write_lines(result)
+
+    async def _load_one(self, payload):
+        """压测模式下发送单个请求，返回 (耗时微秒, 是否成功)"""
+        try:
+            async with self._sem:
+                t0 = time.perf_counter_ns()
+                async with self.session.post(EXTRACT_URL, data=payload, timeout=EXTRACT_TIMEOUT) as response:
+                    await self.read_body(response)
+                    return (time.perf_counter_ns() - t0) // 1000, response.status == 200
+        except Exception:
+            return None, False
+
+    async def run_load(self, rounds):
+        """压测模式: 将全部用例请求体回放rounds轮，统计吞吐量与延迟分位数"""
+        corpus = LOAD_CORPUS * rounds
+        lines = self.test_header_lines(f"压测模式 ({rounds} 轮 × {len(LOAD_CORPUS)} 请求, 并发 {self.concurrency})")
+        
+        t0 = time.perf_counter_ns()
+        results = await asyncio.gather(*(self._load_one(payload) for payload in corpus))
+        wall_s = (time.perf_counter_ns() - t0) / 1e9
+        
+        latencies = [elapsed_us / 1000 for elapsed_us, ok in results if ok]
+        lines.append(f"🎯 总请求: {len(corpus)} | ✅ 成功: {len(latencies)} | ❌ 失败: {len(corpus) - len(latencies)}")
+        lines.append(f"🚀 吞吐量: {len(latencies) / wall_s:.1f} 成功请求/秒 | ⏱️ 总耗时: {wall_s:.2f} 秒")
+        if len(latencies) >= 2:
+            pct = statistics.quantiles(latencies, n=100, method="inclusive")
+            lines.append(f"📊 延迟: p50 {pct[49]:.1f}ms | p95 {pct[94]:.1f}ms | p99 {pct[98]:.1f}ms | 最大 {max(latencies):.1f}ms")
+        
+        self.write_lines(lines)
+        return len(latencies) == len(corpus)
 
     def print_summary(self):
         """打印测试总结"""
-        self.print_test_header("测试总结报告")
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        lines = self.test_header_lines("测试总结报告")
         
         total_tests = len(self.test_results)
-        successful_tests = len([r for r in self.test_results if r.get('success', False)])
+        successful_tests = self._successful
+        by_input_type = self._by_input_type
+        error_types = self._error_types
         
-        print(f"🎯 总测试: {total_tests} | ✅ 成功: {successful_tests} | ❌ 失败: {total_tests - successful_tests}")
-        print(f"📈 成功率: {successful_tests/total_tests*100:.1f}%" if total_tests > 0 else "📈 成功率: 0%")
+        lines.append(f"🎯 总测试: {total_tests} | ✅ 成功: {successful_tests} | ❌ 失败: {total_tests - successful_tests}")
+        lines.append(f"📈 成功率: {successful_tests/total_tests*100:.1f}%" if total_tests > 0 else "📈 成功率: 0%")
         
         if successful_tests > 0:
-            avg_response_time = sum(r.get('response_time', 0) for r in self.test_results if r.get('success')) / successful_tests
-            print(f"⏱️  平均响应时间: {avg_response_time:.2f} 秒")
+            avg_elapsed_us = self._total_elapsed_us / successful_tests
+            lines.append(f"⏱️  平均响应时间: {avg_elapsed_us / 1e6:.2f} 秒")
+            lines.append(f"⚡ 最快响应: {self._min_elapsed_us / 1e6:.2f} 秒 | 🐢 最慢响应: {self._max_elapsed_us / 1e6:.2f} 秒")
         
         # 按输入类型统计
-        string_tests = [r for r in self.test_results if r.get('input_type') == '字符串']
-        array_tests = [r for r in self.test_results if r.get('input_type') == '数组']
-        
-        if string_tests:
-            string_success = len([r for r in string_tests if r.get('success')])
-            print(f"📝 字符串格式: {string_success}/{len(string_tests)} 成功")
+        if '字符串' in by_input_type:
+            string_total, string_success = by_input_type['字符串']
+            lines.append(f"📝 字符串格式: {string_success}/{string_total} 成功")
             
-        if array_tests:
-            array_success = len([r for r in array_tests if r.get('success')])
-            print(f"📋 数组格式: {array_success}/{len(array_tests)} 成功")
+        if '数组' in by_input_type:
+            array_total, array_success = by_input_type['数组']
+            lines.append(f"📋 数组格式: {array_success}/{array_total} 成功")
+        
+        # 失败原因统计
+        if error_types:
+            lines.append("❗ 失败原因:")
+            for error_type, count in error_types.most_common():
+                lines.append(f"  • {error_type}: {count} 次")
+        
+        if self.task_errors:
+            lines.append(f"💥 执行异常: {len(self.task_errors)} 个")
+            lines.extend(f"  • {error}" for error in self.task_errors)
+        
+        self.report_lines(lines)
 
     def print_database_guide(self):
         """打印数据库验证指南"""
-        self.print_test_header("数据库验证指南")
-        
-        print("🔗 数据库: localhost:3306/base_data_graph (root/123456)")
-        print("\n📋 快速验证SQL:")
-        print("```sql")
-        print("-- 检查所有表数据统计")
-        print("SELECT 'celebrity' as table_name, COUNT(*) as count FROM celebrity")
-        print("UNION SELECT 'work', COUNT(*) FROM work")
-        print("UNION SELECT 'event', COUNT(*) FROM event")
-        print("UNION SELECT 'celebrity_celebrity', COUNT(*) FROM celebrity_celebrity")
-        print("UNION SELECT 'celebrity_work', COUNT(*) FROM celebrity_work")
-        print("UNION SELECT 'celebrity_event', COUNT(*) FROM celebrity_event")
-        print("UNION SELECT 'event_work', COUNT(*) FROM event_work")
-        print("ORDER BY count DESC;")
-        print("```")
-        
-        print("\n🗑️  清理测试数据:")
-        print("```sql")
-        print("-- 清理关系表")
-        print("TRUNCATE TABLE celebrity_celebrity, celebrity_work, celebrity_event, event_work;")
-        print("-- 清理主表")
-        print("TRUNCATE TABLE celebrity, work, event;")
-        print("```")
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        lines = self.test_header_lines("数据库验证指南")
+        
+        lines.append("🔗 数据库: localhost:3306/base_data_graph (root/123456)")
+        lines.append(_QUICK_VERIFY_SQL)
+        lines.append(_CLEANUP_SQL)
+        
+        self.report_lines(lines)
 
     def print_feature_summary(self):
         """打印功能特性总结"""
-        self.print_test_header("异步提取服务特性总结")
-        
-        print("📋 异步接口:")
-        print("  ✅ POST /api/v1/async/extract - 异步文本提取")
-        print("  ✅ GET /api/v1/async/info - 服务信息")
-        print("  ✅ GET /api/v1/async/health - 健康检查")
-        
-        print("\n🔧 技术特性:")
-        print("  • 立即响应: 所有请求立即返回成功状态")
-        print("  • 后台处理: 实际提取在后台异步执行")
-        print("  • 智能长度检测: ≤2000字符直接处理，>2000字符分批处理")
-        print("  • 格式支持: 支持字符串和JSON数组两种输入格式")
-        print("  • 参数灵活: extractParams支持triples/entities/relations，默认triples")
-        print("  • 高性能缓存: Caffeine缓存，提升处理效率")
-        print("  • 并行处理: 最多3个分片同时处理")
-        print("  • 数据库集成: 7张表完整存储知识图谱数据")
-        print("  • 完整关系支持: 人-人、人-作品、人-事件、事件-作品关系")
-        print("  • 完善的错误处理和日志记录")
-
-def main():
-    """主函数"""
-    print("🧪 异步提取服务集成测试")
-    print("=" * 80)
-    print(f"📅 测试时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("🎯 目标: 验证异步提取接口完整功能")
-    
-    tester = AsyncExtractTester()
-    
-    # 检查服务健康状态
-    if not tester.check_service_health():
-        print("❌ 服务不可用，测试终止")
-        sys.exit(1)
-    
-    # 获取服务信息
-    tester.test_service_info()
-    
-    # 错误场景测试
-    tester.test_error_scenarios()
-    
-    # 字符串格式测试
-    tester.run_string_format_tests()
-    
-    # JSON数组格式测试
-    tester.run_array_format_tests()
-    
-    # 默认参数测试
-    tester.run_default_params_tests()
-    
-    # 事件-作品关系测试
-    tester.run_event_work_tests()
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        lines = self.test_header_lines("异步提取服务特性总结")
+        lines.append(_FEATURE_SUMMARY)
+        
+        self.report_lines(lines)
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="异步提取服务集成测试")
+    parser.add_argument("--verbose", action="store_true", default=VERBOSE,
+                        help="打印完整的响应JSON（也可通过 TEST_VERBOSE=1 开启）")
+    parser.add_argument("--load", type=int, default=0, metavar="N",
+                        help="压测模式: 将全部用例回放N轮并统计延迟分位数（会产生真实的后台提取任务）")
+    # 字符串默认值同样经过type=int转换，非法的环境变量值会得到参数错误提示而不是回溯
+    parser.add_argument("--concurrency", type=int, default=_CONCURRENCY_ENV, metavar="C",
+                        help=f"最大并发请求数，默认 {CONCURRENCY}（环境变量 EXTRACT_TEST_CONCURRENCY）")
+    args = parser.parse_args()
+    # 并发数为0时信号量永远无法获取，测试会一直挂起
+    if args.concurrency < 1:
+        parser.error(f"--concurrency / EXTRACT_TEST_CONCURRENCY 必须 >= 1，当前为 {args.concurrency}")
+    if args.load < 0:
+        parser.error(f"--load 不能为负数，当前为 {args.load}")
+    return args
+
+async def main(verbose=VERBOSE, load=0, concurrency=CONCURRENCY):
+    """主函数，返回进程退出码"""
+    print("\n".join([
+        "🧪 异步提取服务集成测试",
+        _SEP_WIDE,
+        f"📅 测试时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "🎯 目标: 验证异步提取接口完整功能"
+    ]))
     
-    # 长文本处理测试
-    tester.run_long_text_tests()
+    async with AsyncExtractTester(verbose=verbose, concurrency=concurrency) as tester:
+        # 健康检查与服务信息请求相互独立，同时发出
+        health = asyncio.ensure_future(tester.check_service_health())
+        info = asyncio.ensure_future(tester.test_service_info(after=health))
+        
+        # 检查服务健康状态
+        if not await health:
+            info.cancel()
+            print("❌ 服务不可用，测试终止")
+            return 1
+        
+        # 获取服务信息
+        await info
+        
+        # 压测模式只回放请求并统计延迟，不执行功能测试
+        if load > 0:
+            return 0 if await tester.run_load(load) else 1
+        
+        # 错误场景、字符串/数组格式、默认参数、事件-作品关系、长文本测试并发执行
+        await tester.run_all()
+        if not tester.service_available:
+            print(f"\n⛔ 连续 {MAX_FAIL_STREAK} 次提取请求失败，服务判定为不可用，剩余用例已跳过")
     
     # 打印总结
     tester.print_summary()
@@ -472,10 +899,32 @@ def main():
     tester.print_feature_summary()
     
     test_end_time = datetime.now()
-    test_duration = (test_end_time - tester.test_start_time).total_seconds()
+    test_duration = (time.perf_counter_ns() - tester.test_start_ns) / 1e9
     
-    print(f"\n✅ 测试完成: {test_end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"🎊 异步提取服务测试成功 - 总耗时: {test_duration:.1f} 秒")
+    if tester.all_passed():
+        print(f"\n✅ 测试完成: {test_end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+              f"🎊 异步提取服务测试成功 - 总耗时: {test_duration:.1f} 秒")
+        return 0
+    
+    print(f"\n✅ 测试完成: {test_end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+          f"❌ 异步提取服务测试存在失败用例 - 总耗时: {test_duration:.1f} 秒")
+    return 1
+
+def run_main(coro):
+    """运行主协程，返回其结果
+
+    uvloop 可降低事件循环调度开销，仅在脚本入口处启用，导入本模块不会修改全局事件循环策略；
+    未安装或平台不支持（如 Windows）时回退到默认事件循环
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if not hasattr(asyncio, "Runner"):  # Python < 3.11
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = parse_args()
+    sys.exit(run_main(main(verbose=args.verbose, load=args.load, concurrency=args.concurrency))) 
\ No newline at end of file